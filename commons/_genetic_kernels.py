@@ -0,0 +1,102 @@
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional: without it, kernels run as plain (slower) python
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Fallback decorator, returning the decorated function untouched"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda function: function
+
+# Genetic operators working on (n_individuals, n_loci) int8 genotype matrices and (n_individuals,) fitness vectors.
+# Random numbers are drawn by the caller (see Genetic.breed), so kernels are deterministic given their inputs.
+
+@njit(cache=True, parallel=True)
+def tournament_select(fitness:np.ndarray, candidates:np.ndarray, out:np.ndarray) -> None:
+    """Writes in out[i] the index of the fittest individual among candidates[i, :]
+
+    Args:
+        fitness (np.ndarray): (n_individuals,) fitness of the individuals in the population.
+        candidates (np.ndarray): (n_tournaments, tournament_size) indices of the individuals taking part in each tournament.
+        out (np.ndarray): (n_tournaments,) array storing the index of the winner of each tournament.
+    """
+    for i in prange(candidates.shape[0]):
+        winner = candidates[i, 0]
+        for j in range(1, candidates.shape[1]):
+            if fitness[candidates[i, j]] > fitness[winner]:
+                winner = candidates[i, j]
+        out[i] = winner
+
+@njit(cache=True, parallel=True)
+def crossover_batch(parents_a:np.ndarray, parents_b:np.ndarray, loci:np.ndarray, dom_mask:np.ndarray, out:np.ndarray) -> None:
+    """Writes in out[i] the recombination of parents_a[i] and parents_b[i]. Genes before loci[i] come from the dominant
+    parent, which is parents_a[i] when dom_mask[i] is True and parents_b[i] otherwise.
+
+    Args:
+        parents_a (np.ndarray): (n_offspring, n_loci) genotypes of the first parents.
+        parents_b (np.ndarray): (n_offspring, n_loci) genotypes of the second parents.
+        loci (np.ndarray): (n_offspring,) recombination loci.
+        dom_mask (np.ndarray): (n_offspring,) whether or not the first parent is dominant.
+        out (np.ndarray): (n_offspring, n_loci) genotypes of the recombinant individuals.
+    """
+    for i in prange(out.shape[0]):
+        for locus in range(out.shape[1]):
+            if (locus < loci[i]) == dom_mask[i]:
+                out[i, locus] = parents_a[i, locus]
+            else:
+                out[i, locus] = parents_b[i, locus]
+
+@njit(cache=True, parallel=True)
+def mutate_batch(genotypes:np.ndarray, loci:np.ndarray, alternatives:np.ndarray, alt_genes:np.ndarray) -> None:
+    """Mutates, in place, genotypes[i] at loci[i, :] using the alternatives[i, :]-th alternative of the original genes.
+    As in Genetic.mutate, a locus drawn more than once is mutated from its original gene, the last draw winning.
+
+    Args:
+        genotypes (np.ndarray): (n_individuals, n_loci) genotypes to mutate.
+        loci (np.ndarray): (n_individuals, n_mutations) loci at which each genotype mutates.
+        alternatives (np.ndarray): (n_individuals, n_mutations) column of `alt_genes` to use for each mutation.
+        alt_genes (np.ndarray): (G, G-1) table whose row g stores all the genes other than g.
+    """
+    for i in prange(genotypes.shape[0]):
+        original = genotypes[i].copy()
+        for j in range(loci.shape[1]):
+            genotypes[i, loci[i, j]] = alt_genes[original[loci[i, j]], alternatives[i, j]]
+
+@njit(cache=True)
+def breed(
+    genotypes:np.ndarray,
+    fitness:np.ndarray,
+    candidates:np.ndarray,
+    cut_loci:np.ndarray,
+    dom_mask:np.ndarray,
+    mut_loci:np.ndarray,
+    alternatives:np.ndarray,
+    alt_genes:np.ndarray) -> np.ndarray:
+    """Produces the genotypes of a whole batch of offspring: each offspring is the mutated recombination of the
+    winners of two tournaments.
+
+    Args:
+        genotypes (np.ndarray): (n_individuals, n_loci) genotypes of the population.
+        fitness (np.ndarray): (n_individuals,) fitness of the individuals in the population.
+        candidates (np.ndarray): (2*n_offspring, tournament_size) individuals taking part in each tournament.
+        cut_loci (np.ndarray): (n_offspring,) recombination loci.
+        dom_mask (np.ndarray): (n_offspring,) whether or not the first parent is dominant.
+        mut_loci (np.ndarray): (n_offspring, n_mutations) loci at which each offspring mutates.
+        alternatives (np.ndarray): (n_offspring, n_mutations) column of `alt_genes` to use for each mutation.
+        alt_genes (np.ndarray): (G, G-1) table whose row g stores all the genes other than g.
+
+    Returns:
+        np.ndarray: (n_offspring, n_loci) int8 genotypes of the offspring.
+    """
+    n_offspring = cut_loci.shape[0]
+    parents = np.empty(candidates.shape[0], dtype=np.int64)
+    tournament_select(fitness, candidates, parents)
+
+    offspring = np.empty((n_offspring, genotypes.shape[1]), dtype=np.int8)
+    crossover_batch(genotypes[parents[:n_offspring]], genotypes[parents[n_offspring:]], cut_loci, dom_mask, offspring)
+    mutate_batch(offspring, mut_loci, alternatives, alt_genes)
+
+    return offspring
@@ -1,27 +1,75 @@
 from xautodl.models.cell_infers.tiny_network import TinyNetwork
 from torch.nn import Module
 from typing import Iterable, Callable, Tuple, List, Union
+from collections.abc import Sequence
 import numpy as np
-from copy import deepcopy as copy
+from copy import copy
 from .nats_interface import NATSInterface
 from .utils import *
+from ._genetic_kernels import breed
 from itertools import chain
+from weakref import WeakValueDictionary
+import heapq
+from concurrent.futures import ProcessPoolExecutor
+import os
 
 
 NATSPATH = str(get_project_root()) + "/archive/NATS-tss-v1_0-3ffb9-simple/"
 
+# networks currently held by some individual, keyed on (archive path, dataset, architecture string). Values are
+# weak references, so a network is released as soon as no individual uses it anymore
+_net_registry = WeakValueDictionary()
+
+def _query_cached(interface:NATSInterface, arch_str:str) -> TinyNetwork: 
+    """Returns the (untrained) network of architecture `arch_str`, shared by all the live individuals with the same 
+    architecture. Architecture indices and network configurations are cached by `interface`, so duplicate genotypes
+    only hit the search space once per run."""
+    key = (interface.path, interface.dataset, arch_str)
+    net = _net_registry.get(key)
+    if net is None: 
+        net = interface.query_with_architecture(architecture_string=arch_str, return_cell_structure=False)
+        _net_registry[key] = net
+    return net
+
+def _query_batch_cached(interface:NATSInterface, arch_strings:List[str]) -> List[TinyNetwork]: 
+    """Batched version of `_query_cached`: networks not in the registry are built with one `query_batch` call"""
+    nets = {arch_str: _net_registry.get((interface.path, interface.dataset, arch_str)) for arch_str in arch_strings}
+    missing = [arch_str for arch_str, net in nets.items() if net is None]
+    if missing: 
+        for arch_str, net in zip(missing, interface.query_batch(missing)): 
+            nets[arch_str] = _net_registry[(interface.path, interface.dataset, arch_str)] = net
+    return [nets[arch_str] for arch_str in arch_strings]
+
+# search space interface of fitness-evaluation worker processes, created once per process
+_worker_interface = None
+
+def _init_worker(path:str, dataset:str): 
+    """Instantiates the search space interface of a worker process"""
+    global _worker_interface
+    _worker_interface = NATSInterface(path=path, dataset=dataset)
+
+def _evaluate_genotype(genotype:np.ndarray, fitness_function:Callable) -> float: 
+    """Evaluates `fitness_function` on an individual rebuilt (in a worker process) from `genotype`"""
+    return fitness_function(Individual(net=None, genotype=genotype, searchspace_interface=_worker_interface))
+
 class Individual(): 
     def __init__(
         self, 
         net:TinyNetwork, 
-        genotype:list, 
+        genotype:Union[list, np.ndarray], 
         age:int=0,
         dataset:str="cifar10", 
         searchspace_interface:object=None):
         
         self.scores = {}
-        self.net = net
+        # network is only materialized from the genotype when first accessed
+        self._net = net
+        # genotype is stored as an int8 array of indices of the operations in GENOME
+        if genotype is not None and not isinstance(genotype, np.ndarray): 
+            genotype = genotype_to_indices(genotype=genotype)
         self._genotype = genotype
+        # architecture string of the genotype, lazily computed when first needed
+        self._arch_str = None
         self.age = age
 
         self._fitness = 0
@@ -31,24 +79,48 @@ class Individual():
             self.interface = NATSInterface(path=NATSPATH, dataset=dataset)
         else: 
             self.interface = searchspace_interface
+    
+    def clone_for_offspring(self): 
+        """Returns a new individual with a copy of the current genotype, sharing the search space interface.
+        The network is not copied, as it is re-built from the genotype of the offspring when needed."""
+        return Individual(net=None, genotype=self._genotype.copy(), age=0, searchspace_interface=self.interface)
             
     def update_net(self):
         """Over-writes net field in light of genotype"""
-        genotype_arch_str = genotype_to_architecture(self.genotype)
-        self.net, _ = self.interface.query_with_architecture(architecture_string=genotype_arch_str)
+        self._net = _query_cached(self.interface, self.arch_str)
+
+    @property
+    def net(self): 
+        if self._net is None: 
+            self.update_net()
+        return self._net
+    
+    @net.setter
+    def net(self, new_net:TinyNetwork): 
+        self._net = new_net
 
     @property
     def genotype(self): 
         return self._genotype
+    
+    @property
+    def arch_str(self) -> str: 
+        """Architecture string corresponding to the genotype"""
+        if self._arch_str is None: 
+            self._arch_str = genotype_to_architecture(self._genotype)
+        return self._arch_str
 
-    def update_genotype(self, new_genotype:List): 
-        """Update current genotype with new one. When doing so, also the network field is updated"""
+    def update_genotype(self, new_genotype:np.ndarray) -> "Individual": 
+        """Update current genotype with new one. When doing so, the network field is invalidated and re-built on next access.
+        Returns the individual itself, so that updates can be chained"""
         # sanity check on new genotype
         if not genotype_is_valid(genotype=new_genotype):
-            ValueError(f"genotype {new_genotype} is not a valid replacement for {self.genotype}!")
+            raise ValueError(f"genotype {new_genotype} is not a valid replacement for {self.genotype}!")
 
         self._genotype = new_genotype
-        self.update_net()
+        self._arch_str = None
+        self._net = None
+        return self
 
     @property
     def fitness(self): 
@@ -79,43 +151,49 @@ class Genetic:
         genome:Iterable[str], 
         strategy:Tuple[str, str]="comma", 
         tournament_size:int=5,
-        cross_p:float=0.5):
+        cross_p:float=0.5, 
+        seed:int=None):
         
-        self.genome = set(genome) if not isinstance(genome, set) else genome
+        # genotypes store genes as indices in GENOME, which is then the only genome operators can work with
+        if set(genome) != set(GENOME): 
+            raise ValueError(f"Genome {set(genome)} differs from the operations of the search space {set(GENOME)}!")
+        self.genome = GENOME
+        self.G = len(self.genome)
+        # _alt_genes[g] stores all the genes other than g, i.e. the candidate mutations of g
+        self._alt_genes = np.array([[x for x in range(self.G) if x != g] for g in range(self.G)], dtype=np.int8)
+        # single generator driving all the random draws of genetic operators
+        self.rng = np.random.default_rng(seed)
         self.strategy = strategy
         self.tournament_size = tournament_size
         self.cross_probability = cross_p
 
     def tournament(self, population:Iterable[Individual]) -> Iterable[Individual]:
         """Return tournament, i.e. a random subset of population of size tournament size"""
-        return np.random.choice(a=population, size=self.tournament_size).tolist()
+        if not isinstance(population, Sequence): 
+            population = list(population)
+        return [population[idx] for idx in self.rng.choice(len(population), size=self.tournament_size, replace=False)]
     
     def obtain_parents(self, population:Iterable[Individual], n_parents:int=2) -> Iterable[Individual]:
         """Obtain n_parents from population. Parents are defined as the fittest individuals in n_parents tournaments"""
-        tournament = self.tournament(population = population)
-        # parents are defined as fittest individuals in tournaments
-        parents = sorted(tournament, key = lambda individual: individual.fitness, reverse=True)[:n_parents]
+        parents = []
+        for _ in range(n_parents): 
+            tournament = self.tournament(population = population)
+            # parents are defined as fittest individuals in tournaments
+            parents.append(max(tournament, key=lambda individual: individual._fitness))
         return parents
     
     def mutate(self, individual:Individual, n_loci:int=1) -> Individual: 
         """Applies mutation to a given individual"""
-        for _ in range(n_loci): 
-            mutant_genotype = individual.genotype
-            # select a locus in the genotype (that is, where mutation will occurr)
-            mutant_locus = np.random.randint(low=0, high=len(mutant_genotype))
-            # mapping the locus to the actual gene that will effectively change
-            mutant_gene = mutant_genotype[mutant_locus]
-            operation, level = mutant_gene.split("~")  # splits the gene into operation and level
-            # mutation changes gene, so the current one must be removed from the pool of candidate genes
-            mutations = self.genome.difference([operation])
-            
-            # overwriting the mutant gene with a new one
-            mutant_genotype[mutant_locus] = np.random.choice(a=list(mutations)) + f"~{level}"
+        genotype = individual.genotype
+        mutant_genotype = genotype.copy()
+        # select the loci in the genotype (that is, where mutation will occurr)
+        loci = self.rng.integers(0, len(genotype), size=n_loci)
+        # sampling among the alternatives of each gene guarantees the mutant gene differs from the current one
+        alternatives = self.rng.integers(0, self.G - 1, size=n_loci)
+        # overwriting the mutant genes with new ones
+        mutant_genotype[loci] = self._alt_genes[genotype[loci], alternatives]
 
-        mutant_individual = Individual(net=None, genotype=None)
-        mutant_individual.update_genotype(mutant_genotype)
-
-        return mutant_individual
+        return individual.clone_for_offspring().update_genotype(mutant_genotype)
     
     def recombine(self, individuals:Iterable[Individual], n_parts:int=2) -> Individual: 
         """Performs recombination of two given `individuals`"""
@@ -123,24 +201,55 @@ class Genetic:
             raise ValueError("Number of individuals cannot be different from 2!")
         
         individual1, individual2 = individuals
-        recombinant = copy(individual1)
         
+        n_loci = len(individual1.genotype)
         # select the index in which to cut down the individual
-        recombination_locus = np.random.randint(low=0, high=len(individual1.genotype)-1)
+        recombination_locus = self.rng.integers(0, n_loci)
+        # loci before the recombination locus are inherited from the dominant individual
+        mask = np.arange(n_loci) < recombination_locus
         # individual1 is dominant in the recombinant with probability self.cross_p
-        realization = np.random.random()
-        # defining new genotype of recombinant individual
-        if realization < self.cross_probability:
-            recombinant_genotype = chain(individual1.genotype[:recombination_locus], individual2.genotype[recombination_locus:])
+        if self.rng.random() < self.cross_probability:
+            dominant, submissive = individual1, individual2
         else:
-            recombinant_genotype = chain(individual2.genotype[:recombination_locus], individual1.genotype[recombination_locus:])
+            dominant, submissive = individual2, individual1
+        # defining new genotype of recombinant individual
+        recombinant_genotype = np.where(mask, dominant._genotype, submissive._genotype)
         
-        recombinant = Individual(net=None, genotype=None)
-        recombinant.update_genotype(list(recombinant_genotype))
-
-        return recombinant
+        return dominant.clone_for_offspring().update_genotype(recombinant_genotype)
+    
+    def breed(self, population:"PopulationSoA", n_offspring:int, n_loci:int=1) -> np.ndarray: 
+        """Produces the genotypes of `n_offspring` individuals in one call. Each offspring is the recombination of the 
+        winners of two tournaments, mutated in `n_loci` loci. As in `tournament`, the individuals taking part in each 
+        tournament are sampled without replacement.
+        
+        Args: 
+            population (PopulationSoA): Population from which parents are selected.
+            n_offspring (int): Number of offspring to produce.
+            n_loci (int, optional): Number of loci mutated in each offspring. Defaults to 1.
+        
+        Returns: 
+            np.ndarray: (n_offspring, genotype_length) int8 genotypes of the offspring.
+        """
+        n_individuals, genotype_length = population.genotypes.shape
+        if self.tournament_size > n_individuals: 
+            raise ValueError(f"Tournament size ({self.tournament_size}) larger than population ({n_individuals})!")
+        # each row takes the `tournament_size` smallest of n_individuals uniform draws: a random subset of the population,
+        # found in linear time
+        candidates = np.argpartition(
+            self.rng.random((2 * n_offspring, n_individuals)), self.tournament_size - 1, axis=1
+        )[:, :self.tournament_size]
+        return breed(
+            population.genotypes, 
+            population.fitness, 
+            candidates, 
+            self.rng.integers(0, genotype_length, size=n_offspring), 
+            self.rng.random(n_offspring) < self.cross_probability, 
+            self.rng.integers(0, genotype_length, size=(n_offspring, n_loci)), 
+            self.rng.integers(0, self.G - 1, size=(n_offspring, n_loci)), 
+            self._alt_genes
+        )
 
-class Population: 
+class Population(Sequence): 
     def __init__(self, space:object, individual:object=Individual, init_population:Union[bool, Iterable]=True, n_individuals:int=20): 
         self.space = space
         self.individual = individual
@@ -151,39 +260,153 @@ class Population:
         
         self.oldest = None
         self.worst_n = None
+        # (n_individuals, n_loci) matrix of genotypes, lazily built when first needed
+        self._geno_matrix = None
+        # (n_individuals,) vector of fitness values, set whenever fitness is (re)computed
+        self._fitness_vec = None
+        # scores whose extremes are incrementally updated when individuals are added/removed
+        self._tracked_extremes = set()
+        # worker processes for parallel fitness evaluation, lazily spawned and reused across generations
+        self._executor = None
+        self._executor_workers = None
     
     def __iter__(self): 
-        for i in self._population: 
-            yield i
+        return iter(self._population)
+    
+    def __len__(self): 
+        return len(self._population)
+    
+    def __getitem__(self, idx:Union[int, slice]) -> Union[Individual, List[Individual]]: 
+        return self._population[idx]
     
     @property
     def individuals(self):
         return self._population
     
+    @property
+    def genotypes(self) -> np.ndarray: 
+        """Returns the genotypes of the population as a (n_individuals, n_loci) int8 matrix"""
+        if self._geno_matrix is None: 
+            self._geno_matrix = np.stack([individual._genotype for individual in self._population])
+        return self._geno_matrix
+    
+    @property
+    def fitness_vec(self) -> np.ndarray: 
+        """Returns the fitness values of the population as a (n_individuals,) float32 vector"""
+        if self._fitness_vec is None: 
+            self._fitness_vec = np.fromiter(
+                (individual._fitness for individual in self._population), dtype=np.float32, count=len(self._population)
+            )
+        return self._fitness_vec
+    
+    def _update_extremes(self, removed:List[Individual], added:List[Individual]): 
+        """Incrementally updates tracked extremes after `removed`/`added` individuals leave/join the population"""
+        for score in list(self._tracked_extremes): 
+            min_value, max_value = getattr(self, f"min_{score}"), getattr(self, f"max_{score}")
+            # removing an extreme or adding an individual not scored yet requires a full pass
+            if any(getattr(individual, score, None) in (min_value, max_value) for individual in removed) or \
+               not all(hasattr(individual, score) for individual in added): 
+                self._tracked_extremes.discard(score)
+                delattr(self, f"min_{score}")
+                delattr(self, f"max_{score}")
+            elif added: 
+                values = self.gather_score(score=score, individuals=added)
+                setattr(self, f"max_{score}", max(max_value, values.max()))
+                setattr(self, f"min_{score}", min(min_value, values.min()))
+    
     def update_population(self, new_population:Iterable[Individual]): 
         """Overwrites current population with new one stored in `new_population`"""
         if all([isinstance(el, Individual) for el in new_population]):
-            del self._population
+            old_ids, new_ids = {id(el) for el in self._population}, {id(el) for el in new_population}
+            removed = [el for el in self._population if id(el) not in new_ids]
+            added = [el for el in new_population if id(el) not in old_ids]
+
             self._population = new_population
+            self._geno_matrix = None
+            self._fitness_vec = None
+            self._update_extremes(removed=removed, added=added)
         else:
             raise ValueError("new_population is not an Iterable of `Individual` datatype!")
 
     def fittest_n(self, n:int=1): 
         """Return first `n` individuals based on fitness value"""
-        return sorted(self._population, key=lambda individual: individual.fitness, reverse=True)[:n]
+        # same as the head of the (stably) sorted population, without sorting it all
+        return heapq.nlargest(n, self._population, key=lambda individual: individual.fitness)
     
     def update_ranking(self): 
         """Updates the ranking in the population in light of fitness value"""
-        sorted_individuals = sorted(self._population, key=lambda individual: individual.fitness, reverse=True)
+        fitness = self.gather_score(score="_fitness")
+        # ranks[i] is the position of the i-th individual in the population sorted by decreasing fitness
+        order = np.argsort(-fitness, kind="stable")
+        ranks = np.empty_like(order)
+        ranks[order] = np.arange(len(order))
         
         # ranking in light of individuals 
-        for ranking, individual in enumerate(sorted_individuals):
+        for individual, ranking in zip(self._population, ranks.tolist()):
             individual.update_ranking(new_rank=ranking)
 
-    def update_fitness(self, fitness_function:Callable): 
-        """Updates the fitness value of individuals in the population"""
-        for individual in self.individuals: 
-            individual.overwrite_fitness(fitness_function(individual))
+    def prefetch_nets(self): 
+        """Materializes, with a single batched query, the networks of all the individuals not having one yet"""
+        unqueried = [individual for individual in self._population if individual._net is None]
+        if unqueried: 
+            nets = _query_batch_cached(self.space, [individual.arch_str for individual in unqueried])
+            for individual, net in zip(unqueried, nets): 
+                individual.net = net
+
+    def update_fitness(self, fitness_function:Callable, n_workers:int=1, prefetch_nets:bool=False): 
+        """Updates the fitness value of individuals in the population
+        
+        Args: 
+            fitness_function (Callable): function mapping an individual to its fitness value.
+            n_workers (int, optional): Number of processes evaluating `fitness_function` in parallel. When larger than 1, 
+                                       `fitness_function` must be picklable and only rely on the genotype and the
+                                       network of the individual, which are rebuilt in each worker process. 
+                                       Parallel evaluation is only used for populations of at least 2*n_workers
+                                       individuals, to amortize the cost of spawning processes. Worker processes
+                                       are spawned on first use and reused by later calls until `close()`. None
+                                       uses all the available CPUs. Defaults to 1.
+            prefetch_nets (bool, optional): Whether to build the missing networks with one batched query before a 
+                                            serial evaluation. Only useful when `fitness_function` accesses the
+                                            network of the individuals. Defaults to False.
+        """
+        n_workers = os.cpu_count() if n_workers is None else n_workers
+        if n_workers > 1 and len(self._population) >= 2 * n_workers: 
+            fitness = self._get_executor(n_workers=n_workers).map(
+                _evaluate_genotype, 
+                [individual._genotype for individual in self._population], 
+                [fitness_function] * len(self._population),
+                chunksize=max(1, len(self._population) // n_workers)
+            )
+            self._fitness_vec = np.fromiter(fitness, dtype=np.float32, count=len(self._population))
+        else: 
+            if prefetch_nets: 
+                self.prefetch_nets()
+            
+            self._fitness_vec = np.fromiter(
+                (fitness_function(individual) for individual in self._population), dtype=np.float32, count=len(self._population)
+            )
+        # mirroring fitness values on the individuals (which also marks the fitness order as stale)
+        for individual, fitness in zip(self._population, self._fitness_vec.tolist()): 
+            individual.overwrite_fitness(fitness)
+    
+    def _get_executor(self, n_workers:int) -> ProcessPoolExecutor: 
+        """Returns the pool of `n_workers` processes evaluating fitness, spawning it if not yet available"""
+        if self._executor is None or self._executor_workers != n_workers: 
+            self.close()
+            self._executor = ProcessPoolExecutor(
+                max_workers=n_workers, 
+                initializer=_init_worker, 
+                initargs=(self.space.path, self.space.dataset)
+            )
+            self._executor_workers = n_workers
+        return self._executor
+    
+    def close(self): 
+        """Shuts down the worker processes used for parallel fitness evaluation, if any"""
+        if self._executor is not None: 
+            self._executor.shutdown()
+            self._executor = None
+            self._executor_workers = None
     
     def apply_on_individuals(self, function:Callable, inplace:bool=True)->Union[Iterable, None]: 
         """Applies a function on each individual in the population
@@ -191,67 +414,59 @@ class Population:
         Args: 
             function (Callable): function to apply on each individual. Must return an object of class Individual.
             inplace (bool, optional): Whether to apply the function on the individuals in current population or
-                                      on a copy of these.
+                                      on a shallow copy of these. Copies share network and search space interface 
+                                      with the original individuals.
         Returns: 
             Union[Iterable, None]: Iterable when inplace=False represents the individuals with function applied.
                                    None represents the output when inplace=True (hence function is applied on the
                                    actual population.
         """
-        modified_individuals = [function(individual) for individual in copy(self._population)]
+        if inplace: 
+            modified_individuals = [function(individual) for individual in self._population]
+        else: 
+            modified_individuals = [function(copy(individual)) for individual in self._population]
         if inplace:
             self.update_population(new_population=modified_individuals)
         else:
             return modified_individuals 
 
-    def set_extremes(self, score:str):
-        """Set the maximal&minimal value in the population for the score 'score' (must be a class attribute)"""
-        # sorting in ascending order
-        min_value = getattr(min(self.individuals, key=lambda ind: getattr(ind, score)), score)
-        max_value = getattr(max(self.individuals, key=lambda ind: getattr(ind, score)), score)
+    def gather_score(self, score:str, individuals:List[Individual]=None) -> np.ndarray: 
+        """Returns the values of the score 'score' (must be a class attribute) across the population (or `individuals`)"""
+        individuals = self._population if individuals is None else individuals
+        return np.fromiter((getattr(individual, score) for individual in individuals), dtype=np.float64, count=len(individuals))
 
-        setattr(self, f"max_{score}", max_value)
-        setattr(self, f"min_{score}", min_value)
+    def set_extremes(self, score:str, values:np.ndarray=None):
+        """Set the maximal&minimal value in the population for the score 'score' (must be a class attribute).
+        Extremes are then kept up to date as individuals are added to or removed from the population"""
+        values = self.gather_score(score=score) if values is None else values
 
+        setattr(self, f"max_{score}", values.max())
+        setattr(self, f"min_{score}", values.min())
+        self._tracked_extremes.add(score)
 
-    def normalize_scores(self, score:str, inplace:bool=True)->Union[Iterable, None]: 
-        """Normalizes the scores (stored as class attributes) of each individual with respect to the maximal"""
+    def normalize_scores(self, score:str, inplace:bool=True)->Union[np.ndarray, None]: 
+        """Normalizes the scores (stored as class attributes) of each individual with respect to the maximal.
+        When inplace=False, individuals are left untouched and the normalized values are returned instead."""
         if not isinstance(score, str): 
             raise ValueError(f"Input score '{score}' is not a string!")
 
-        try:
-            min_value, max_value = getattr(self, f"min_{score}"), getattr(self, f"max_{score}")
-            # mapping score values in the [0,1] range using min-max normalization
-            modified_individuals = copy(self.individuals)
-
-            def minmax_individual(individual:Individual):
-                """Normalizes in the [0,1] range the value of a given score"""
-                new_individual = copy(individual)
-                if getattr(new_individual, score) > 1: # only remapping elements not in the [0,1] range
-                    setattr(
-                        new_individual,
-                        score, 
-                        (getattr(individual, score) - min_value) / (max_value - min_value) if max_value != min_value else 0
-                        )
-                else:
-                    pass
-                return new_individual
-
-            # normalizing
-            new_population = list(map(
-                # mapping each score value in the [0,1] range considering population-wise metrics
-                minmax_individual,
-                # looping in all individuals
-                modified_individuals
-            ))
-
-            if inplace: 
-                self.update_population(new_population=new_population)
-            else: 
-                return new_population
-            
-        except AttributeError:  # extremes attribute not present... sorting&setting 
-            self.set_extremes(score=score)
-            self.normalize_scores(score)
+        values = self.gather_score(score=score)
+        if not (hasattr(self, f"min_{score}") and hasattr(self, f"max_{score}")):  # extremes not present... setting
+            self.set_extremes(score=score, values=values)
+        
+        min_value, max_value = getattr(self, f"min_{score}"), getattr(self, f"max_{score}")
+        # mapping score values in the [0,1] range using min-max normalization
+        normalized = (values - min_value) / (max_value - min_value) if max_value != min_value else np.zeros_like(values)
+        # only remapping elements not in the [0,1] range
+        normalized = np.where(values > 1, normalized, values)
+
+        if inplace: 
+            for individual, value in zip(self._population, normalized.tolist()): 
+                setattr(individual, score, value)
+            # extremes refer to the values before normalization, which incoming individuals cannot be compared to
+            self._tracked_extremes.discard(score)
+        else: 
+            return normalized
     
     def age(self): 
         """Embeds ageing into the process"""
@@ -263,7 +478,11 @@ class Population:
     
     def add_to_population(self, new_individuals:Iterable[Individual]): 
         """Add new_individuals to population"""
+        new_individuals = list(new_individuals)
         self._population = list(chain(self.individuals, new_individuals))
+        self._geno_matrix = None
+        self._fitness_vec = None
+        self._update_extremes(removed=[], added=new_individuals)
     
     def remove_from_population(self, attribute:str="fitness", n:int=1, ascending:bool=True): 
         """Remove first/last `n` elements from sorted population population in `ascending/descending`
@@ -271,7 +490,8 @@ class Population:
         
         if not all([hasattr(el, attribute) for el in self.individuals]):
             raise ValueError(f"Attribute '{attribute}' is not an attribute of all the individuals!")
-        # sort the population based on the value of attribute
+        # sort the population based on the value of attribute. Survivors are kept sorted, so that later removals
+        # break ties the same way
         sorted_population = sorted(self.individuals, key=lambda ind: getattr(ind, attribute), reverse=False if ascending else True)
         
         # new population is old population minus the `n` worst individuals with respect to `attribute`
@@ -302,14 +522,132 @@ class Population:
         """Sets worst n elements based on the value of arbitrary attribute"""
         self.worst_n = sorted(self.individuals, key=lambda ind: getattr(ind, attribute))[:n]
     
+class IndividualRow: 
+    """Thin handle to one row of a `PopulationSoA`, exposing it with the same fields of an `Individual`"""
+    # maps Individual attributes to the PopulationSoA arrays storing them
+    _fields = {
+        "genotype": "genotypes", "_genotype": "genotypes",
+        "fitness": "fitness", "_fitness": "fitness",
+        "rank": "rank", "_rank": "rank",
+        "age": "age"
+    }
+
+    def __init__(self, population:"PopulationSoA", row:int): 
+        object.__setattr__(self, "population", population)
+        object.__setattr__(self, "row", row)
+    
+    def __getattr__(self, name:str): 
+        if name not in IndividualRow._fields: 
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        return self.population.arrays[IndividualRow._fields[name]][self.row]
+    
+    def __setattr__(self, name:str, value): 
+        if name in IndividualRow._fields: 
+            self.population.arrays[IndividualRow._fields[name]][self.row] = value
+        else: 
+            object.__setattr__(self, name, value)
+    
+    @property
+    def interface(self): 
+        return self.population.space
+    
+    @property
+    def net(self): 
+        """Network of the individual, queried from the search space of the population"""
+        net = _query_cached(self.population.space, genotype_to_architecture(self.genotype))
+        return net
+    
+    def clone_for_offspring(self) -> Individual: 
+        """Returns a new (standalone) individual with a copy of the genotype of this row"""
+        return Individual(net=None, genotype=self.genotype.copy(), age=0, searchspace_interface=self.population.space)
+    
+    def update_genotype(self, new_genotype:np.ndarray) -> "IndividualRow": 
+        """Overwrites the genotype stored in this row with `new_genotype`. Returns the row itself, so that updates 
+        can be chained"""
+        if not genotype_is_valid(genotype=new_genotype):
+            raise ValueError(f"genotype {new_genotype} is not a valid replacement for {self.genotype}!")
+        
+        self.genotype = new_genotype if isinstance(new_genotype, np.ndarray) else genotype_to_indices(new_genotype)
+        return self
+
+class PopulationSoA(Sequence): 
+    """Population stored as a structure of arrays: the i-th row of each array refers to the i-th individual. 
+    Genetic operators can then work on contiguous numpy arrays rather than on lists of `Individual` objects."""
+    def __init__(
+        self, 
+        genotypes:np.ndarray, 
+        fitness:np.ndarray=None, 
+        age:np.ndarray=None, 
+        space:NATSInterface=None, 
+        rng:Union[int, np.random.Generator]=None): 
+        
+        self.genotypes = np.ascontiguousarray(genotypes, dtype=np.int8)
+        n_individuals = len(self.genotypes)
+        self.fitness = np.zeros(n_individuals, dtype=np.float32) if fitness is None else np.asarray(fitness, dtype=np.float32)
+        self.rank = np.zeros(n_individuals, dtype=np.int32)
+        self.age = np.zeros(n_individuals, dtype=np.int32) if age is None else np.asarray(age, dtype=np.int32)
+        
+        self.space = space
+        # passing the generator of a `Genetic` object (Genetic.rng) draws from its stream rather than from a new one
+        self.rng = np.random.default_rng(rng)
+
+    @classmethod
+    def from_population(cls, population:Population, rng:Union[int, np.random.Generator]=None) -> "PopulationSoA": 
+        """Builds the structure-of-arrays layout of `population`"""
+        return cls(
+            genotypes=population.genotypes, 
+            fitness=population.fitness_vec, 
+            age=np.fromiter((individual.age for individual in population), dtype=np.int32, count=len(population)), 
+            space=population.space, 
+            rng=rng
+        )
+    
+    @property
+    def arrays(self) -> dict: 
+        return {"genotypes": self.genotypes, "fitness": self.fitness, "rank": self.rank, "age": self.age}
+    
+    def __len__(self): 
+        return len(self.genotypes)
+    
+    def __getitem__(self, idx:Union[int, slice]) -> Union[IndividualRow, List[IndividualRow]]: 
+        if isinstance(idx, slice): 
+            return [IndividualRow(population=self, row=row) for row in range(*idx.indices(len(self)))]
+        if not -len(self) <= idx < len(self): 
+            raise IndexError(f"Index {idx} out of range for a population of {len(self)} individuals!")
+        return IndividualRow(population=self, row=idx % len(self))
+    
+    def tournament(self, tournament_size:int=5) -> int: 
+        """Returns the index of the fittest individual in a tournament of size `tournament_size`"""
+        idx = self.rng.choice(len(self), size=tournament_size, replace=False)
+        return idx[self.fitness[idx].argmax()]
+    
+    def obtain_parents(self, tournament_size:int=5, n_parents:int=2) -> np.ndarray: 
+        """Returns the indices of the winners of `n_parents` independent tournaments"""
+        if tournament_size > len(self): 
+            raise ValueError(f"Tournament size ({tournament_size}) larger than population ({len(self)})!")
+        # each tournament draws `tournament_size` distinct individuals, as the first entries of a random shuffle
+        idx = np.argpartition(self.rng.random((n_parents, len(self))), tournament_size - 1, axis=1)[:, :tournament_size]
+        return idx[np.arange(n_parents), self.fitness[idx].argmax(axis=1)]
+    
+    def update_ranking(self): 
+        """Updates the ranking in the population in light of fitness value"""
+        self.rank[np.argsort(-self.fitness, kind="stable")] = np.arange(len(self), dtype=np.int32)
+    
+    def ageing(self): 
+        """Embeds ageing into the process"""
+        self.age += 1
+
 
 def generate_population(searchspace_interface:NATSInterface, individual:Individual, n_individuals:int=20)->list: 
-    """Generate a population of individuals"""
-    # at first generate full architectures and cell-structure
-    architectures, cells = searchspace_interface.generate_random_samples(n_samples=n_individuals)
+    """Generate a population of individuals. Networks are only built when first needed"""
+    # at first generate cell-structures only
+    cells = searchspace_interface.generate_random_cells(n_samples=n_individuals)
     
     # mapping strings to list of genes (~genome)
     genotypes = map(lambda cell: architecture_to_genotype(cell), cells)
-    # turn full architecture and cell-structure into genetic population individual
-    population = [individual(net=net, genotype=genotype) for net, genotype in zip(architectures, genotypes)]
+    # turn cell-structure into genetic population individual
+    population = [
+        individual(net=None, genotype=genotype, searchspace_interface=searchspace_interface) 
+        for genotype in genotypes
+    ]
     return population
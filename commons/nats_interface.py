@@ -12,6 +12,7 @@ class NATSInterface:
         verbose:bool=False
         ):
     
+        self._path = path
         self._api = create(file_path_or_dict=path, search_space="topology", fast_mode=True, verbose=verbose)
         # sanity check on the given dataset
         self.NATS_datasets = ["cifar10", "cifar100", "imagenet16-120"]
@@ -19,11 +20,17 @@ class NATSInterface:
             raise ValueError(f"Dataset '{dataset}' not in {self.NATS_datasets}!")
         
         self._dataset = dataset
+        # (architecture string, dataset) -> (index, net config). Configs are small and the search space is finite
+        self._net_configs = {}
 
     @property
     def dataset(self): 
         return self._dataset
     
+    @property
+    def path(self): 
+        return self._path
+    
     @dataset.setter
     def change_dataset(self, new_dataset:str): 
         """Updates the current dataset with a new one"""
@@ -76,6 +83,24 @@ class NATSInterface:
             else: 
                 return tinynet, net_config["arch_str"] # untrained network
     
+    def query_net_config(self, architecture_string:str) -> Tuple[int, dict]: 
+        """This function returns the index and the network configuration of `architecture_string` architecture, 
+        querying the search space only the first time a given architecture is considered.
+
+        Args:
+            architecture_string (str): String representing a given architecture.
+
+        Returns:
+            Tuple[int, dict]: Index and configuration of the corresponding network.
+        """
+        key = (architecture_string, self._dataset)
+        if key not in self._net_configs: 
+            if not cellstructure_isvalid(input_str=architecture_string): 
+                raise ValueError(f"Architecture {architecture_string} is not valid in NATS search space!")
+            architecture_idx = self._api.query_index_by_arch(arch=architecture_string)
+            self._net_configs[key] = architecture_idx, self._api.get_net_config(index=architecture_idx, dataset=self._dataset)
+        return self._net_configs[key]
+
     def query_with_architecture(
         self, 
         architecture_string:str, 
@@ -92,11 +117,7 @@ class NATSInterface:
         Returns:
             TinyNetwork: Either untrained or trained network corresponding to index idx.
         """
-        if not cellstructure_isvalid(input_str=architecture_string): 
-            raise ValueError(f"Architecture {architecture_string} is not valid in NATS search space!")
-
-        architecture_idx = self._api.query_index_by_arch(arch=architecture_string)
-        net_config = self._api.get_net_config(index=architecture_idx, dataset=self._dataset)
+        architecture_idx, net_config = self.query_net_config(architecture_string=architecture_string)
         tinynet = get_cell_based_tiny_net(config=net_config)
 
         if return_cell_structure:
@@ -113,6 +134,22 @@ class NATSInterface:
             else: 
                 return tinynet
     
+    def query_batch(self, arch_strings:List[str]) -> List[TinyNetwork]: 
+        """This function returns the (untrained) TinyNetwork objects associated to many architectures at once. 
+        Each distinct architecture is mapped to its configuration only once, and networks are built in increasing index order.
+
+        Args:
+            arch_strings (List[str]): Strings representing the considered architectures.
+
+        Returns:
+            List[TinyNetwork]: Untrained networks, in the same order of `arch_strings`. Duplicate architectures share the same network.
+        """
+        configs = {arch: self.query_net_config(architecture_string=arch) for arch in dict.fromkeys(arch_strings)}
+        tinynets = {
+            idx: get_cell_based_tiny_net(config=net_config) for idx, net_config in sorted(configs.values(), key=lambda c: c[0])
+        }
+        return [tinynets[configs[arch][0]] for arch in arch_strings]
+    
     def query(
         self, 
         input_query:Tuple[int, str], 
@@ -189,3 +226,9 @@ class NATSInterface:
         cell_structures = [self.query_with_index(i)[1] for i in idxs]
         # return tinynets and cell_structures_string
         return tinynets, cell_structures
+    
+    def generate_random_cells(
+        self, 
+        n_samples:int=10) -> List[str]:
+        """Generate a group of cell structures chosen at random, without building the corresponding networks"""
+        return [self._api.arch(self._api.random()) for _ in range(n_samples)]
@@ -1,6 +1,13 @@
 from pathlib import Path
 from itertools import chain
-from typing import List
+from typing import List, Tuple, Union
+import numpy as np
+
+# operations of the NATS topology search space. Sorting makes the position of each operation a stable gene index
+GENOME = tuple(sorted({'none', 'nor_conv_3x3', 'avg_pool_3x3', 'skip_connect', 'nor_conv_1x1'}))
+GENOME_SET = frozenset(GENOME)
+# input node of each locus of the cell structure, i.e. the "~level" suffix of the operation at that locus
+LOCI_LEVELS = (0, 0, 1, 0, 1, 2)
 
 def get_project_root(): 
     """
@@ -25,8 +32,22 @@ def architecture_to_genotype(arch_str:str)->List:
     ops = chain(*[subcell.split("|")[1:-1] for subcell in subcells])  # divide into different nodes to retrieve ops
     return list(ops)
 
-def genotype_to_architecture(genotype:List)->str: 
-    """Reformats genotype as architecture string"""
+def genotype_to_indices(genotype:List, gene_table:Tuple[str]=GENOME)->np.ndarray: 
+    """Turn genotype list into an array of gene indices
+    
+    Args: 
+        genotype (List): List of genes (in the "operation~level" format) of a given individual.
+        gene_table (Tuple[str], optional): Operations each gene index refers to. Defaults to GENOME.
+    
+    Returns: 
+        np.ndarray: int8 array storing, for each locus, the index of its operation in `gene_table`.
+    """
+    return np.fromiter((gene_table.index(gene.split("~")[0]) for gene in genotype), dtype=np.int8, count=len(genotype))
+
+def genotype_to_architecture(genotype:Union[List, np.ndarray], gene_table:Tuple[str]=GENOME)->str: 
+    """Reformats genotype (either list of genes or array of gene indices) as architecture string"""
+    if isinstance(genotype, np.ndarray):  # mapping gene indices to operations, level is given by the locus
+        genotype = [f"{gene_table[gene]}~{level}" for gene, level in zip(genotype, LOCI_LEVELS)]
     return "|{}|+|{}|{}|+|{}|{}|{}|".format(*genotype)
 
 def cellstructure_isvalid(input_str:str)->bool: 
@@ -42,11 +63,13 @@ def cellstructure_isvalid(input_str:str)->bool:
     is_valid = all([(n in all_ops) or (n in all_numbers) for n in subops]) # check if the full string is valid
     return is_valid
 
-def genotype_is_valid(genotype:List)->bool:
+def genotype_is_valid(genotype:Union[List, np.ndarray], genome:frozenset=GENOME_SET)->bool:
     """Checks whether or not genotype is valid for the NATS Bench topology space"""
-    all_ops = {'none', 'nor_conv_3x3', 'avg_pool_3x3', 'skip_connect', 'nor_conv_1x1'}
+    if isinstance(genotype, np.ndarray):  # array of gene indices
+        return len(genotype) == len(LOCI_LEVELS) and bool(np.all((genotype >= 0) & (genotype < len(genome))))
+
     all_numbers = {'0', '1', '2'}
 
     subops = chain(*[op.split("~") for op in genotype]) # divide into operation and node
-    is_valid = all([(n in all_ops) or (n in all_numbers) for n in subops]) # check if the full string is valid
+    is_valid = all([(n in genome) or (n in all_numbers) for n in subops]) # check if the full string is valid
     return is_valid
\ No newline at end of file
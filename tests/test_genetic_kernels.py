@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from commons import _genetic_kernels
+from commons.genetics import Genetic, Individual
+from commons.utils import GENOME
+
+N_INDIVIDUALS, N_OFFSPRING, TOURNAMENT_SIZE, N_MUTATIONS = 12, 8, 4, 2
+
+
+class ScriptedGenerator:
+    """Stand-in for np.random.Generator returning fixed draws, in the order Genetic operators consume them"""
+    def __init__(self, draws:list):
+        self.draws = iter(draws)
+
+    def choice(self, *args, **kwargs):
+        return next(self.draws)
+
+    integers = random = choice
+
+
+@pytest.fixture(params=["compiled", "python"])
+def kernels(request, monkeypatch):
+    """Genetic kernels, either as compiled by numba or as the plain python functions they are compiled from"""
+    if request.param == "python":
+        if not hasattr(_genetic_kernels.breed, "py_func"):
+            pytest.skip("numba is not installed, kernels already are plain python functions")
+        for kernel in ("tournament_select", "crossover_batch", "mutate_batch", "breed"):
+            monkeypatch.setattr(_genetic_kernels, kernel, getattr(_genetic_kernels, kernel).py_func)
+    return _genetic_kernels
+
+
+def test_breed_matches_genetic_operators(kernels):
+    rng = np.random.default_rng(0)
+    genotypes = rng.integers(0, len(GENOME), size=(N_INDIVIDUALS, 6)).astype(np.int8)
+    fitness = rng.random(N_INDIVIDUALS).astype(np.float32)
+    # tournaments of distinct individuals, as drawn by Genetic.tournament
+    candidates = np.stack([rng.permutation(N_INDIVIDUALS)[:TOURNAMENT_SIZE] for _ in range(2 * N_OFFSPRING)])
+    cut_loci = rng.integers(0, 6, size=N_OFFSPRING)
+    dom_mask = rng.random(N_OFFSPRING) < 0.5
+    mut_loci = rng.integers(0, 6, size=(N_OFFSPRING, N_MUTATIONS))
+    mut_loci[0] = 3  # a locus drawn twice is mutated from its original gene
+    alternatives = rng.integers(0, len(GENOME) - 1, size=(N_OFFSPRING, N_MUTATIONS))
+
+    genetic = Genetic(genome=GENOME, tournament_size=TOURNAMENT_SIZE, cross_p=0.5)
+    population = []
+    for genotype, value in zip(genotypes, fitness.tolist()):
+        individual = Individual(net=None, genotype=genotype.copy(), searchspace_interface=object())
+        individual.overwrite_fitness(value)
+        population.append(individual)
+
+    expected = []
+    for i in range(N_OFFSPRING):
+        genetic.rng = ScriptedGenerator([
+            candidates[i], candidates[N_OFFSPRING + i],  # tournaments of the two parents
+            cut_loci[i], 0.0 if dom_mask[i] else 1.0,  # recombination locus and dominant parent
+            mut_loci[i], alternatives[i]  # mutation loci and alternative genes
+        ])
+        parents = genetic.obtain_parents(population=population)
+        offspring = genetic.mutate(genetic.recombine(parents), n_loci=N_MUTATIONS)
+        expected.append(offspring.genotype)
+
+    offspring = kernels.breed(
+        genotypes, fitness, candidates, cut_loci, dom_mask, mut_loci, alternatives, genetic._alt_genes
+    )
+    assert offspring.dtype == np.int8
+    np.testing.assert_array_equal(offspring, np.stack(expected))